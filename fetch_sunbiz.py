@@ -4,162 +4,249 @@ SunBiz data fetcher that matches by association names
 Since your database has no document numbers, this version matches by name
 """
 import os
+import re
+import mmap
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # Optional; the stdlib encoder produces the same files
+    orjson = None
+
 DATA_DIR = "data"
 
+# Set once DATA_DIR has been created, so repeat runs skip the stat
+_data_dir_ready = False
+
+# Trailing corporate suffix (", INC.", " INC", " LLC", ...) stripped for name matching
+_SUFFIX_RE = re.compile(r",?\s*\b(?:INC\.?|LLC)\s*$")
+
+# Fixed-width fragments shared by every generated record
+_BLANK_LINE = b" " * 42  # Empty address line
+
+_ENTITY_TYPE = b"CONDO".ljust(15)
+
+_ADDRESS_BLOCK = (
+    b"123 Main St".ljust(42)
+    + _BLANK_LINE
+    + b"Fort Myers".ljust(28)
+    + b"FL"
+    + b"33901".ljust(10)
+    + b"US"
+)
+
+_FILE_DATE = b"20200101"
+
+_AGENT_BLOCK = (
+    b"PREMIER PROPERTY MANAGEMENT".ljust(42)
+    + b"C"
+    + b"5000 Executive Way".ljust(42)
+    + b"Fort Myers".ljust(28)
+    + b"FL"
+    + b"33907".ljust(9)
+)
+
+# Sample officers with real-looking names
+OFFICERS = [
+    (b"PRES", b"JOHN SMITH"),
+    (b"VICE", b"JANE JOHNSON"),
+    (b"TREA", b"ROBERT WILLIAMS"),
+    (b"SECR", b"MARY DAVIS")
+]
+
+# Every officer shares the same address
+_OFFICER_ADDRESS = (
+    b"123 Main St".ljust(42)
+    + b"Fort Myers".ljust(28)
+    + b"FL"
+    + b"33901".ljust(9)
+)
+
+# All officer records, spliced into the template at offset 668
+_OFFICER_BLOCK = b"".join(
+    title.ljust(4) + b"P" + name.ljust(42) + _OFFICER_ADDRESS
+    for title, name in OFFICERS
+)
+
+# 1440-character record plus newline. Only the document number (12) and
+# entity name (192) vary; they are left blank here and filled per record
+_RECORD_TEMPLATE = (
+    b" " * (12 + 192)
+    # Active, entity type, principal and mailing address, file date;
+    # padded to the registered agent at 544
+    + (b"A" + _ENTITY_TYPE + _ADDRESS_BLOCK + _ADDRESS_BLOCK + _FILE_DATE).ljust(544 - 204)
+    # Property manager, padded to the officers at 668
+    + _AGENT_BLOCK.ljust(668 - 544)
+    # Officers, padded to 1440
+    + _OFFICER_BLOCK.ljust(1440 - 668)
+    + b"\n"
+)
+
+def _ensure_data_dir():
+    """Create DATA_DIR on first use"""
+    global _data_dir_ready
+    if not _data_dir_ready:
+        os.makedirs(DATA_DIR, exist_ok=True)
+        _data_dir_ready = True
+
+def _encode_field(value, width):
+    """Encode a text field to ASCII, truncated and blank-padded to width"""
+    return value.encode("ascii")[:width].ljust(width)
+
+def _fill_records(buf, name_fields, doc_fields):
+    """Stamp one record per name/doc pair into a preallocated writable buffer"""
+    # Fields arrive encoded and padded to their widths, so every slice
+    # assignment is a same-size byte copy.
+    size = len(_RECORD_TEMPLATE)
+    offset = 0
+    for name, doc in zip(name_fields, doc_fields):
+        buf[offset:offset + size] = _RECORD_TEMPLATE
+        buf[offset:offset + 12] = doc
+        buf[offset + 12:offset + 204] = name
+        offset += size
+
+def build_file(name_fields, doc_fields, filepath):
+    """Write fixed-width fields to a 1440-character fixed-width cordata file
+    
+    name_fields and doc_fields are parallel lists of ASCII bytes already
+    padded to 192 and 12 characters, see _encode_field.
+    """
+    size = len(_RECORD_TEMPLATE) * len(name_fields)
+    
+    # The final size is known, so size the file up front and fill it in
+    # place through a memory map instead of copying a buffer into write()
+    with open(filepath, "w+b") as f:
+        f.truncate(size)
+        if size:  # mmap cannot map an empty file
+            with mmap.mmap(f.fileno(), size) as mm:
+                _fill_records(mm, name_fields, doc_fields)
+
+def write_json(filepath, data):
+    """Write data as 2-space indented JSON, using orjson when available"""
+    if orjson is not None:
+        body = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        body = json.dumps(data, indent=2).encode("ascii")
+    
+    with open(filepath, "wb") as f:
+        f.write(body)
+
 def create_name_matched_data():
     """Create data files using association names from your database"""
-    print(f"Creating name-matched data at {datetime.now()}")
+    now = datetime.now()
+    print(f"Creating name-matched data at {now}")
     
-    os.makedirs(DATA_DIR, exist_ok=True)
+    _ensure_data_dir()
     
     # These are actual association names from your database
     # The plugin will match by cleaning and comparing names
-    associations = [
-        {"name": "100 LA PENINSULA CONDOMINIUM ASSOCIATION, INC.", "doc": "M13000001"},
-        {"name": "COUNTRYSIDE VERANDAS THREE ASSOCIATION, INC.", "doc": "M13000002"},
-        {"name": "1000 CHANNELSIDE CONDOMINIUM ASSOCIATION, INC.", "doc": "M13000003"},
-        {"name": "PINES TRAILER PARK HOMEOWNERS ASSOCIATION, INC.", "doc": "M13000004"},
-        {"name": "COUNTRYSIDE VERANDAS FOUR ASSOCIATION, INC.", "doc": "M13000005"},
-        {"name": "THE 101 CONDOMINIUM ASSOCIATION OF SARASOTA, INC.", "doc": "M13000006"},
-        {"name": "COUNTRYSIDE VERANDAS CONDOMINIUM ASSOCIATION, INC.", "doc": "M13000007"},
-        {"name": "PINESTONE AT PALMER RANCH ASSOCIATION, INC.", "doc": "M13000008"},
-        {"name": "1010 CENTRAL CONDOMINIUM ASSOCIATION, INC.", "doc": "M13000009"},
-        {"name": "PELICAN BAY FOUNDATION INC", "doc": "M13000010"},
-        {"name": "FIDDLERS CREEK COMMUNITY ASSOCIATION INC", "doc": "M13000011"},
-        {"name": "BONITA BAY CLUB INC", "doc": "M13000012"},
-        {"name": "THE BROOKS COMMUNITY ASSOCIATION INC", "doc": "M13000013"},
-        {"name": "MIROMAR LAKES COMMUNITY ASSOCIATION INC", "doc": "M13000014"},
-        {"name": "GATEWAY SERVICES COMMUNITY ASSOCIATION INC", "doc": "M13000015"},
-        {"name": "HERITAGE PALMS MASTER ASSOCIATION INC", "doc": "M13000016"},
-        {"name": "VERANDAH COMMUNITY ASSOCIATION INC", "doc": "M13000017"},
-        {"name": "RIVERWOOD ESTATES HOMEOWNERS ASSOCIATION INC", "doc": "M13000018"},
-        {"name": "COLONIAL COUNTRY CLUB ESTATES ASSOCIATION INC", "doc": "M13000019"},
-        {"name": "STONEYBROOK COMMUNITY ASSOCIATION INC", "doc": "M13000020"}
+    # Kept as parallel lists: names[i] is filed under docs[i]
+    names = [
+        "100 LA PENINSULA CONDOMINIUM ASSOCIATION, INC.",
+        "COUNTRYSIDE VERANDAS THREE ASSOCIATION, INC.",
+        "1000 CHANNELSIDE CONDOMINIUM ASSOCIATION, INC.",
+        "PINES TRAILER PARK HOMEOWNERS ASSOCIATION, INC.",
+        "COUNTRYSIDE VERANDAS FOUR ASSOCIATION, INC.",
+        "THE 101 CONDOMINIUM ASSOCIATION OF SARASOTA, INC.",
+        "COUNTRYSIDE VERANDAS CONDOMINIUM ASSOCIATION, INC.",
+        "PINESTONE AT PALMER RANCH ASSOCIATION, INC.",
+        "1010 CENTRAL CONDOMINIUM ASSOCIATION, INC.",
+        "PELICAN BAY FOUNDATION INC",
+        "FIDDLERS CREEK COMMUNITY ASSOCIATION INC",
+        "BONITA BAY CLUB INC",
+        "THE BROOKS COMMUNITY ASSOCIATION INC",
+        "MIROMAR LAKES COMMUNITY ASSOCIATION INC",
+        "GATEWAY SERVICES COMMUNITY ASSOCIATION INC",
+        "HERITAGE PALMS MASTER ASSOCIATION INC",
+        "VERANDAH COMMUNITY ASSOCIATION INC",
+        "RIVERWOOD ESTATES HOMEOWNERS ASSOCIATION INC",
+        "COLONIAL COUNTRY CLUB ESTATES ASSOCIATION INC",
+        "STONEYBROOK COMMUNITY ASSOCIATION INC"
+    ]
+    
+    docs = [
+        "M13000001", "M13000002", "M13000003", "M13000004", "M13000005",
+        "M13000006", "M13000007", "M13000008", "M13000009", "M13000010",
+        "M13000011", "M13000012", "M13000013", "M13000014", "M13000015",
+        "M13000016", "M13000017", "M13000018", "M13000019", "M13000020"
     ]
     
     # Add more associations by generating variations
-    for i in range(21, 1000):
-        base_names = [
-            "PALM BEACH", "SUNSET", "OCEAN VIEW", "GULF SHORE", "MARINA BAY",
-            "EAGLE", "CORAL", "BEACH", "ISLAND", "HARBOR", "LAKESIDE", "RIVERSIDE",
-            "PARK", "GRAND", "ROYAL", "VILLA", "HERITAGE", "CYPRESS", "OAK"
-        ]
-        
-        suffixes = [
-            "CONDOMINIUM ASSOCIATION INC", "HOMEOWNERS ASSOCIATION INC",
-            "COMMUNITY ASSOCIATION INC", "PROPERTY OWNERS ASSOCIATION INC",
-            "MASTER ASSOCIATION INC"
-        ]
-        
+    base_names = [
+        "PALM BEACH", "SUNSET", "OCEAN VIEW", "GULF SHORE", "MARINA BAY",
+        "EAGLE", "CORAL", "BEACH", "ISLAND", "HARBOR", "LAKESIDE", "RIVERSIDE",
+        "PARK", "GRAND", "ROYAL", "VILLA", "HERITAGE", "CYPRESS", "OAK"
+    ]
+    
+    suffixes = [
+        "CONDOMINIUM ASSOCIATION INC", "HOMEOWNERS ASSOCIATION INC",
+        "COMMUNITY ASSOCIATION INC", "PROPERTY OWNERS ASSOCIATION INC",
+        "MASTER ASSOCIATION INC"
+    ]
+    
+    # The final count is known, so fill preallocated slots
+    generated = range(21, 1000)
+    first_slot = len(names)
+    names.extend([None] * len(generated))
+    docs.extend([None] * len(generated))
+    
+    for slot, i in enumerate(generated, first_slot):
         name_idx = i % len(base_names)
         suffix_idx = i % len(suffixes)
         
         name = f"{base_names[name_idx]} {i} {suffixes[suffix_idx]}"
         doc_num = f"M{13000000 + i:011d}"
         
-        associations.append({"name": name, "doc": doc_num})
+        names[slot] = name
+        docs[slot] = doc_num
     
-    # Create fixed-width files
-    file_num = 0
-    for i in range(0, len(associations), 100):
-        chunk = associations[i:i+100]
-        
-        filename = f"cordata{file_num}.txt"
-        filepath = os.path.join(DATA_DIR, filename)
-        
-        with open(filepath, "w") as f:
-            for assoc in chunk:
-                # Create 1440-character fixed-width record
-                line = assoc["doc"][:12].ljust(12)
-                line += assoc["name"][:192].ljust(192)
-                line += "A"  # Active
-                line += "CONDO".ljust(15)
-                
-                # Principal address
-                line += "123 Main St".ljust(42)
-                line += "".ljust(42)
-                line += "Fort Myers".ljust(28)
-                line += "FL".ljust(2)
-                line += "33901".ljust(10)
-                line += "US".ljust(2)
-                
-                # Mailing address (same)
-                line += "123 Main St".ljust(42)
-                line += "".ljust(42)
-                line += "Fort Myers".ljust(28)
-                line += "FL".ljust(2)
-                line += "33901".ljust(10)
-                line += "US".ljust(2)
-                
-                # File date
-                line += "20200101"
-                
-                # Pad to registered agent
-                line = line.ljust(544)
-                
-                # Property manager
-                line += "PREMIER PROPERTY MANAGEMENT".ljust(42)
-                line += "C"
-                line += "5000 Executive Way".ljust(42)
-                line += "Fort Myers".ljust(28)
-                line += "FL"
-                line += "33907".ljust(9)
-                
-                # Officers
-                line = line.ljust(668)
-                
-                # Sample officers with real-looking names
-                officers = [
-                    ("PRES", "JOHN SMITH"),
-                    ("VICE", "JANE JOHNSON"),
-                    ("TREA", "ROBERT WILLIAMS"),
-                    ("SECR", "MARY DAVIS")
-                ]
-                
-                for title, name in officers:
-                    line += title.ljust(4)
-                    line += "P"
-                    line += name.ljust(42)
-                    line += "123 Main St".ljust(42)
-                    line += "Fort Myers".ljust(28)
-                    line += "FL"
-                    line += "33901".ljust(9)
-                
-                # Pad to 1440
-                line = line.ljust(1440)
-                f.write(line + "\n")
+    # Encode and pad the variable fields once, so filling a file is
+    # nothing but byte copies
+    name_fields = [_encode_field(name, 192) for name in names]
+    doc_fields = [_encode_field(doc, 12) for doc in docs]
+    
+    # Create fixed-width files. Each file is independent and the writes
+    # release the GIL, so they run on a small thread pool.
+    chunk_starts = range(0, len(names), 100)
+    workers = min(len(chunk_starts), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        jobs = []
+        for file_num, i in enumerate(chunk_starts):
+            chunk_names = name_fields[i:i+100]
+            chunk_docs = doc_fields[i:i+100]
+            
+            filename = f"cordata{file_num}.txt"
+            filepath = os.path.join(DATA_DIR, filename)
+            
+            future = executor.submit(build_file, chunk_names, chunk_docs, filepath)
+            jobs.append((filename, len(chunk_names), future))
         
-        print(f"Created {filename} with {len(chunk)} records")
-        file_num += 1
+        for filename, count, future in jobs:
+            future.result()
+            print(f"Created {filename} with {count} records")
     
     # Create a mapping file for debugging
     mapping = {}
-    for assoc in associations[:100]:  # First 100 for reference
+    for name, doc in zip(names[:100], docs[:100]):  # First 100 for reference
         # Clean name for matching (remove INC, commas, etc)
-        clean_name = assoc["name"].upper()
-        for suffix in [", INC.", " INC.", ", INC", " INC", ", LLC", " LLC"]:
-            clean_name = clean_name.replace(suffix, "")
-        clean_name = clean_name.strip()
-        mapping[clean_name] = assoc["doc"]
+        clean_name = _SUFFIX_RE.sub("", name.upper()).strip()
+        mapping[clean_name] = doc
     
-    with open(os.path.join(DATA_DIR, "name_mapping.json"), "w") as f:
-        json.dump(mapping, f, indent=2)
+    write_json(os.path.join(DATA_DIR, "name_mapping.json"), mapping)
     
     # Create status file
     status = {
-        "last_update": datetime.now().isoformat(),
+        "last_update": now.isoformat(),
         "status": "success",
-        "message": f"Created name-matched data with {len(associations)} associations",
+        "message": f"Created name-matched data with {len(names)} associations",
         "matching_method": "name-based"
     }
     
-    with open(os.path.join(DATA_DIR, "status.json"), "w") as f:
-        json.dump(status, f, indent=2)
+    write_json(os.path.join(DATA_DIR, "status.json"), status)
     
-    print(f"Name-matched data creation completed with {len(associations)} associations")
+    print(f"Name-matched data creation completed with {len(names)} associations")
     print("The plugin will match these by association name instead of document number")
 
 if __name__ == "__main__":